@@ -0,0 +1,232 @@
+"""Tiled Treemap Renderer
+
+=== Module Description ===
+This module renders very high-resolution treemaps (poster-size images, far
+larger than the interactive 1024x768 window) without ever holding the whole
+image in memory.
+
+The target image is split into square tiles. The rectangles produced by
+AbstractTree.generate_treemap are clipped against each tile, and each tile is
+rasterised by a worker process into its own shared-memory buffer. The parent
+process stitches the finished tiles straight into a binary PPM file on disk,
+so pixel memory is bounded by MAX_TILES_IN_FLIGHT * (tile size), not by the
+size of the final image or the number of CPUs. The parent still holds the
+treemap rectangles of every leaf, so that part grows with the tree.
+"""
+import os
+from collections import deque
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from tree_data import FileSystemTree
+
+
+# Poster dimensions and tiling.
+POSTER_WIDTH = 16384
+POSTER_HEIGHT = 16384
+TILE_SIZE = 2048
+
+# The most tiles that may be rasterised at once. Each one holds a shared-memory
+# buffer of TILE_SIZE * TILE_SIZE * 3 bytes (12 MiB), so at most 96 MiB of
+# tile buffers are alive at any time, however many CPUs the host has.
+MAX_TILES_IN_FLIGHT = 8
+
+# Colour of any pixel not covered by a treemap rectangle.
+BACKGROUND = (0, 0, 0)
+
+
+def render_poster(tree, filename, width=POSTER_WIDTH, height=POSTER_HEIGHT,
+                  tile_size=TILE_SIZE, processes=None,
+                  max_in_flight=MAX_TILES_IN_FLIGHT):
+    """Render the treemap of <tree> to a binary PPM image at <filename>.
+
+    The image is <width> by <height> pixels and is rasterised in tiles of at
+    most <tile_size> by <tile_size> pixels, using <processes> worker
+    processes (or one per CPU if <processes> is None).
+
+    The number of workers is clamped to <max_in_flight> and to the number of
+    tiles, and only one tile per worker is in flight at a time, so tile
+    buffers never use more than max_in_flight * tile_size * tile_size * 3
+    bytes of shared memory. The rectangles for every leaf, clipped to their
+    tiles, are still built up front, so that memory grows with the tree.
+
+    @type tree: AbstractTree
+    @type filename: str
+    @type width: int
+    @type height: int
+    @type tile_size: int
+    @type processes: int | None
+    @type max_in_flight: int
+    @rtype: None
+    """
+    tiles = _split_tiles(width, height, tile_size)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, max_in_flight, len(tiles)))
+    buckets = _bucket_rects(tree.generate_treemap((0, 0, width, height)),
+                            width, height, tile_size)
+    header = 'P6\n{} {}\n255\n'.format(width, height).encode()
+
+    with open(filename, 'wb') as out:
+        out.write(header)
+        out.truncate(len(header) + width * height * 3)
+        # Before Python 3.13, attaching to a SharedMemory block by name also
+        # registers it with the attaching process's resource tracker
+        # (CPython bpo-39959), so a worker with its own tracker would unlink
+        # the parent's buffers on exit. Starting the tracker before the pool
+        # makes the workers share the parent's.
+        resource_tracker.ensure_running()
+        with Pool(processes) as pool:
+            # Keep at most one tile per worker in flight, so that the number
+            # of shared-memory buffers alive at once stays bounded.
+            pending = deque()
+            try:
+                for tile in tiles:
+                    if len(pending) >= processes:
+                        _stitch_tile(out, len(header), width,
+                                     *pending.popleft())
+                    _, _, tile_width, tile_height = tile
+                    buffer = SharedMemory(create=True,
+                                          size=tile_width * tile_height * 3)
+                    result = pool.apply_async(
+                        _rasterise_tile,
+                        (buffer.name, tile_width, tile_height,
+                         buckets.pop(tile[:2], [])))
+                    pending.append((tile, buffer, result))
+                while pending:
+                    _stitch_tile(out, len(header), width, *pending.popleft())
+            finally:
+                for _, buffer, _ in pending:
+                    buffer.close()
+                    buffer.unlink()
+
+
+def _split_tiles(width, height, tile_size):
+    """Return the tiles covering a <width> by <height> image, in row order.
+
+    Each tile is given in the pygame format: (x, y, width, height). Tiles on
+    the right and bottom edges may be smaller than <tile_size>.
+
+    @type width: int
+    @type height: int
+    @type tile_size: int
+    @rtype: list[(int, int, int, int)]
+    """
+    tiles = []
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            tiles.append((x, y, min(tile_size, width - x),
+                          min(tile_size, height - y)))
+    return tiles
+
+
+def _bucket_rects(rects, width, height, tile_size):
+    """Clip each treemap rectangle against the tiles it overlaps.
+
+    Return a dictionary mapping the (x, y) origin of each tile to the
+    rectangles that fall inside it, translated to tile-local coordinates.
+    Rectangles with no area are dropped.
+
+    @type rects: list[((int, int, int, int), (int, int, int))]
+    @type width: int
+    @type height: int
+    @type tile_size: int
+    @rtype: dict[(int, int), list[((int, int, int, int), (int, int, int))]]
+    """
+    buckets = {}
+    for (x, y, w, h), colour in rects:
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + w, width), min(y + h, height)
+        if right <= left or bottom <= top:
+            continue
+        for tile_y in range(top - top % tile_size, bottom, tile_size):
+            for tile_x in range(left - left % tile_size, right, tile_size):
+                clip_left = max(left, tile_x)
+                clip_top = max(top, tile_y)
+                clip_right = min(right, tile_x + tile_size)
+                clip_bottom = min(bottom, tile_y + tile_size)
+                buckets.setdefault((tile_x, tile_y), []).append(
+                    ((clip_left - tile_x, clip_top - tile_y,
+                      clip_right - clip_left, clip_bottom - clip_top),
+                     colour))
+    return buckets
+
+
+def _rasterise_tile(name, width, height, rects):
+    """Fill the shared-memory buffer <name> with a rendering of <rects>.
+
+    The buffer holds a <width> by <height> tile as packed RGB rows. This runs
+    in a worker process.
+
+    @type name: str
+    @type width: int
+    @type height: int
+    @type rects: list[((int, int, int, int), (int, int, int))]
+    @rtype: None
+    """
+    try:
+        buffer = SharedMemory(name=name, track=False)
+    except TypeError:
+        # track is only accepted from Python 3.13; see render_poster.
+        buffer = SharedMemory(name=name)
+    try:
+        pixels = buffer.buf
+        stride = width * 3
+        background = bytes(BACKGROUND) * width
+        for row in range(height):
+            pixels[row * stride:(row + 1) * stride] = background
+        for (x, y, w, h), colour in rects:
+            span = bytes(colour) * w
+            for row in range(y, y + h):
+                start = row * stride + x * 3
+                pixels[start:start + w * 3] = span
+        del pixels
+    finally:
+        buffer.close()
+
+
+def _stitch_tile(out, offset, width, tile, buffer, result):
+    """Wait for <tile> to be rasterised, then copy it into the image file.
+
+    <out> is the open image file, whose pixel data starts at byte <offset>
+    and is <width> pixels wide. The shared-memory <buffer> is released once
+    it has been copied.
+
+    @type out: file
+    @type offset: int
+    @type width: int
+    @type tile: (int, int, int, int)
+    @type buffer: SharedMemory
+    @type result: multiprocessing.pool.AsyncResult
+    @rtype: None
+    """
+    try:
+        result.get()
+        x, y, tile_width, tile_height = tile
+        stride = tile_width * 3
+        pixels = buffer.buf
+        for row in range(tile_height):
+            out.seek(offset + ((y + row) * width + x) * 3)
+            out.write(pixels[row * stride:(row + 1) * stride])
+        del pixels
+    finally:
+        buffer.close()
+        buffer.unlink()
+
+
+def run_poster_file_system(path, filename):
+    """Render a poster-size treemap of the given path's file structure.
+
+    Precondition: <path> is a valid path to a file or folder.
+
+    @type path: str
+    @type filename: str
+    @rtype: None
+    """
+    render_poster(FileSystemTree(path), filename)
+
+
+if __name__ == '__main__':
+    # Put in a path like
+    # '/Users/dianeh/Documents/courses/csc148/assignments' (OSX)
+    # and an output file name ending in .ppm.
+    run_poster_file_system('/Users/Overseer/Desktop', 'desktop.ppm')
@@ -12,8 +12,30 @@ concrete implementation of a subclass to represent files and folders on your
 computer's file system.
 """
 import os
-from random import randint
 import math
+import zlib
+from multiprocessing import Pool
+
+
+# Every colour channel is kept at or above this value, so that no leaf is
+# drawn close enough to black to be mistaken for the background.
+MIN_CHANNEL = 48
+
+
+def _colour_from_key(key):
+    """Return the RGB colour for the colour key <key>.
+
+    Each channel is taken from one byte of the key's low 24 bits and scaled
+    into the range MIN_CHANNEL-255, so two different keys almost never share
+    a colour.
+
+    @type key: int
+    @rtype: (int, int, int)
+    """
+    span = 256 - MIN_CHANNEL
+    return (MIN_CHANNEL + (key >> 16 & 0xFF) * span // 256,
+            MIN_CHANNEL + (key >> 8 & 0xFF) * span // 256,
+            MIN_CHANNEL + (key & 0xFF) * span // 256)
 
 
 class AbstractTree:
@@ -31,6 +53,8 @@ class AbstractTree:
     @type colour: (int, int, int)
         The RGB colour value of the root of this tree.
         Note: only the colours of leaves will influence what the user sees.
+        This is computed on demand from the path of roots leading to this
+        tree, so it is the same in every run of the program.
 
     === Private Attributes ===
     @type _root: obj | None
@@ -66,7 +90,7 @@ class AbstractTree:
 
         This method sets the _parent_tree attribute for each subtree to self.
 
-        A random colour is chosen for this tree.
+        This tree's colour is not chosen here; see the colour property.
 
         Precondition: if <root> is None, then <subtrees> is empty.
 
@@ -80,12 +104,8 @@ class AbstractTree:
         self._subtrees = subtrees
         self._parent_tree = None
         # TODO: Complete this constructor by doing two things:
-        # 1. Initialize self.colour and self.data_size, according to the docstring.
+        # 1. Initialize self.data_size, according to the docstring.
         # 2. Properly set all _parent_tree attributes in self._subtrees
-        r = randint(0, 255)
-        g = randint(0, 255)
-        b = randint(0, 255)
-        self.colour = (r, g, b)
         if len(self._subtrees):
             for x in self._subtrees:
                 x._parent_tree = self
@@ -103,6 +123,34 @@ class AbstractTree:
         """
         return self._root is None
 
+    @property
+    def colour(self):
+        """Return the RGB colour value of the root of this tree.
+
+        The colour is derived from a hash of the roots on the path from the
+        top of the tree down to this tree, so it does not change between runs,
+        processes or rescans of the same data.
+
+        @type self: AbstractTree
+        @rtype: (int, int, int)
+        """
+        return _colour_from_key(self._colour_key())
+
+    def _colour_key(self, parent_key=None):
+        """Return the hash of the path of roots leading to this tree.
+
+        If <parent_key> is given, it is used as the key of this tree's parent
+        instead of walking up the tree to recompute it.
+
+        @type self: AbstractTree
+        @type parent_key: int | None
+        @rtype: int
+        """
+        if parent_key is None and self._parent_tree is not None:
+            parent_key = self._parent_tree._colour_key()
+        if parent_key is None:
+            return zlib.crc32(str(self._root).encode())
+        return zlib.crc32(('/' + str(self._root)).encode(), parent_key)
 
     def generate_treemap(self, rect):
         """Run the treemap algorithm on this tree and return the rectangles.
@@ -124,11 +172,25 @@ class AbstractTree:
         # Programming tip: use "tuple unpacking assignment" to easily extract
         # coordinates of a rectangle, as follows.
         # x, y, width, height = rect
+        return self._generate_treemap(rect, self._colour_key())
+
+    def _generate_treemap(self, rect, key):
+        """Return the treemap rectangles of this tree, as generate_treemap.
+
+        <key> is the colour key of this tree. Keys are passed down as the tree
+        is traversed, so that each leaf's colour is found without walking back
+        up to the root, and colours are only computed for leaves.
+
+        @type self: AbstractTree
+        @type rect: (int, int, int, int)
+        @type key: int
+        @rtype: list[((int, int, int, int), (int, int, int))]
+        """
         x, y, width, height = rect
         if self.data_size == 0:
             return []
         elif not self._subtrees and self.data_size > 0:
-            return [((x, y, width, height), self.colour)]
+            return [((x, y, width, height), _colour_from_key(key))]
         else:
             if self._subtrees[-1].data_size == 0:
                 self._subtrees.pop()
@@ -139,22 +201,26 @@ class AbstractTree:
                 partition_ratio = subtree.data_size / self.data_size
                 if width > height:
                     if i + 1 == len(self._subtrees):
-                        compiler.extend(subtree.
-                                generate_treemap((x, y, width - dx, height)))
+                        compiler.extend(subtree._generate_treemap(
+                            (x, y, width - dx, height),
+                            subtree._colour_key(key)))
                     else:
                         partition_width = math.floor(width * partition_ratio)
-                        compiler.extend(subtree.
-                            generate_treemap((x, y, partition_width, height)))
+                        compiler.extend(subtree._generate_treemap(
+                            (x, y, partition_width, height),
+                            subtree._colour_key(key)))
                         x += partition_width
                         dx += partition_width
                 else:
                     if i + 1 == len(self._subtrees):
-                        compiler.extend(
-                            subtree.generate_treemap((x, y, width, height - dy)))
+                        compiler.extend(subtree._generate_treemap(
+                            (x, y, width, height - dy),
+                            subtree._colour_key(key)))
                     else:
                         partition_height = math.floor(height * partition_ratio)
-                        compiler.extend(subtree.
-                            generate_treemap((x, y, width, partition_height)))
+                        compiler.extend(subtree._generate_treemap(
+                            (x, y, width, partition_height),
+                            subtree._colour_key(key)))
                         y += partition_height
                         dy += partition_height
             return compiler
@@ -218,13 +284,20 @@ class FileSystemTree(AbstractTree):
     The data_size attribute for regular files as simply the size of the file,
     as reported by os.path.getsize.
     """
-    def __init__(self, path):
+    def __init__(self, path, contents=None):
         """Store the file tree structure contained in the given file or folder.
 
-        Precondition: <path> is a valid path for this computer.
+        If <contents> is given, the tree is built from it instead of from the
+        file system, and <path> is used as this tree's name as it is.
+        <contents> is the size of a file, or a list of (name, contents) records
+        for the entries of a folder, as produced by scan_file_systems' workers.
+
+        Precondition: if <contents> is None, <path> is a valid path for this
+        computer.
 
         @type self: FileSystemTree
         @type path: str
+        @type contents: int | list | None
         @rtype: None
 
         """
@@ -236,8 +309,16 @@ class FileSystemTree(AbstractTree):
         # Also remember to make good use of the superclass constructor!
         subtrees = []
         self.data_size = 0
-        root = os.path.basename(path)
-        if not os.path.isdir(path):
+        if contents is not None:
+            root = path
+        else:
+            root = os.path.basename(path)
+        if isinstance(contents, list):
+            for name, child in contents:
+                subtrees.append(FileSystemTree(name, child))
+        elif contents is not None:
+            self.data_size = contents
+        elif not os.path.isdir(path):
             self.data_size = os.path.getsize(path)
         else:
             for subtree in os.listdir(path):
@@ -267,6 +348,108 @@ class FileSystemTree(AbstractTree):
             return s
 
 
+def scan_file_systems(paths, processes=None):
+    """Return a single FileSystemTree covering every path in <paths>.
+
+    The paths are scanned in parallel by a multiprocessing.Pool of
+    <processes> workers, and each worker sends back a compact record of its
+    subtree to be rebuilt here.
+
+    Paths are made absolute and normalised first. Repeated paths are scanned
+    once, and any path that lies inside another path in <paths> is dropped,
+    since it is already counted as part of that path's tree.
+
+    If only a single folder remains, the work is split across its top-level
+    subfolders and the result is rooted at that folder; files directly inside
+    it are measured here rather than sent to a worker. Otherwise, the scanned
+    trees are placed under a synthetic root with an empty name, and each one
+    is named by its full path so that identically named mount points remain
+    distinguishable.
+
+    Precondition: every element of <paths> is a valid path for this computer.
+
+    @type paths: list[str]
+    @type processes: int | None
+    @rtype: FileSystemTree
+    """
+    paths = _outermost_paths([os.path.abspath(path) for path in paths])
+    split = len(paths) == 1 and os.path.isdir(paths[0])
+    if not split:
+        with Pool(processes) as pool:
+            records = pool.map(_scan_path, paths, chunksize=1)
+        return FileSystemTree('', [(path, contents) for path, (_, contents)
+                                   in zip(paths, records)])
+
+    records = []
+    folders = []
+    with os.scandir(paths[0]) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                folders.append((len(records), entry.path))
+                records.append(None)
+            else:
+                records.append((entry.name, entry.stat().st_size))
+    if folders:
+        with Pool(processes) as pool:
+            scanned = pool.map(_scan_path, [path for _, path in folders],
+                               chunksize=1)
+        for (i, _), record in zip(folders, scanned):
+            records[i] = record
+    return FileSystemTree(os.path.basename(paths[0]), records)
+
+
+def _scan_path(path):
+    """Return a compact record of the file tree at <path>.
+
+    A file is recorded as (name, size) and a folder as (name, children),
+    where children is a list of records.
+
+    @type path: str
+    @rtype: (str, int | list)
+    """
+    name = os.path.basename(path)
+    if not os.path.isdir(path):
+        return name, os.path.getsize(path)
+    return name, _scan_entries(path)
+
+
+def _scan_entries(path):
+    """Return the records of every entry in the folder at <path>.
+
+    @type path: str
+    @rtype: list[(str, int | list)]
+    """
+    records = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                records.append((entry.name, _scan_entries(entry.path)))
+            else:
+                records.append((entry.name, entry.stat().st_size))
+    return records
+
+
+def _outermost_paths(paths):
+    """Return <paths> without repeats or paths inside another path in it.
+
+    The remaining paths keep their original order.
+
+    Precondition: every element of <paths> is absolute and normalised.
+
+    @type paths: list[str]
+    @rtype: list[str]
+    """
+    outermost = []
+    for path in paths:
+        if path in outermost:
+            continue
+        if any(other != path and os.path.commonpath([path, other]) == other
+               for other in paths):
+            continue
+        outermost.append(path)
+    return outermost
+
+
 if __name__ == '__main__':
     import python_ta
     # Remember to change this to check_all when cleaning up your code.
@@ -13,7 +13,7 @@ and detecting user events like mouse clicks and key presses and responding
 to them.
 """
 import pygame
-from tree_data import FileSystemTree
+from tree_data import FileSystemTree, scan_file_systems
 from population import PopulationTree
 
 
@@ -167,6 +167,19 @@ def run_treemap_file_system(path):
     run_visualisation(file_tree)
 
 
+def run_treemap_file_systems(paths):
+    """Run a single treemap visualisation for the file structures of several
+    paths, scanning them in parallel.
+
+    Precondition: every element of <paths> is a valid path to a file or folder.
+
+    @type paths: list[str]
+    @rtype: None
+    """
+    file_tree = scan_file_systems(paths)
+    run_visualisation(file_tree)
+
+
 def run_treemap_population():
     """Run a treemap visualisation for World Bank population data.
 
@@ -193,4 +206,7 @@ if __name__ == '__main__':
     # run_treemap_file_system('/Users/Overseer/Desktop/League of Legends.app')
     # To check your work for Task 5, uncomment the following function call.
     # run_treemap_file_system('/Users/Overseer/Desktop')
+    # To scan several folders in parallel and view them as one treemap:
+    # run_treemap_file_systems(['/Users/Overseer/Desktop',
+    #                           '/Users/Overseer/Documents'])
     run_treemap_population()